@@ -3,26 +3,82 @@ Backend Service - FastAPI Application
 Provides API endpoints that query PostgreSQL database
 """
 
+import asyncio
+import atexit
 import os
 import logging
+import logging.handlers
+import queue
 import sys
-from contextlib import contextmanager
-from typing import Generator
-
-from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
+from datetime import datetime
+from hashlib import blake2b
+from typing import AsyncGenerator, Optional, Type
+
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from prometheus_fastapi_instrumentator import Instrumentator
-import psycopg2
-from psycopg2 import pool
-from psycopg2.extras import RealDictCursor
-from psycopg2 import OperationalError, DatabaseError
-
-# Configure structured logging (JSON format)
-logging.basicConfig(
-    level=logging.INFO,
-    format='{"time":"%(asctime)s", "level":"%(levelname)s", "message":"%(message)s", "module":"%(module)s"}',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+import asyncpg
+import msgspec
+import orjson
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render log records as JSON with orjson
+    Builds a dict per record instead of interpolating a JSON-shaped format
+    string, so messages containing braces or quotes stay valid JSON.
+    Structured fields passed via extra={"extra": {...}} are merged in.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            **getattr(record, "extra", {})
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry).decode()
+
+
+class PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without pre-formatting them
+    The stock prepare() renders the record with this handler's own
+    formatter and nulls exc_info before enqueueing, so the listener's
+    JSONFormatter would see an already-formatted message and no
+    exception data. Only %-args are merged on the caller's thread (they
+    may be mutated before the listener runs); formatting is left
+    entirely to the listener side.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Configure structured logging (JSON format) behind a queue
+# The handler only enqueues records; formatting and the stdout write
+# (which holds a lock and can stall on buffering) happen on a listener
+# thread, keeping log IO off the request critical path. The handler is
+# attached directly rather than via basicConfig, which would give it a
+# default formatter and trigger prepare()'s pre-formatting path.
+log_queue = queue.SimpleQueue()
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(JSONFormatter())
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(PassthroughQueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on shutdown
 logger = logging.getLogger(__name__)
 
 # Database connection parameters
@@ -32,20 +88,114 @@ DB_USER = os.getenv("DB_USER", "postgres")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
 DB_MIN_CONN = int(os.getenv("DB_MIN_CONN", "2"))
 DB_MAX_CONN = int(os.getenv("DB_MAX_CONN", "10"))
+# Pool mode of the upstream pooler: "transaction" (PgBouncer default here)
+# or "session" (direct Postgres / PgBouncer session mode)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "transaction")
+# Max seconds to wait for a pooled connection before failing the request
+DB_ACQUIRE_TIMEOUT = float(os.getenv("DB_ACQUIRE_TIMEOUT", "5"))
+
+# Response cache settings (tables are read-mostly, so a short TTL is safe)
+CACHE_TTL = int(os.getenv("CACHE_TTL", "30"))  # seconds
+
+# Rows fetched per server-side cursor batch on the streaming endpoints
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "1000"))
 
 # Initialize FastAPI application
 app = FastAPI(
     title="Backend Service",
     version="1.0.0",
-    description="Backend API for k8s-platform demo"
+    description="Backend API for k8s-platform demo",
+    # orjson's C encoder handles dict/datetime/UUID natively and is
+    # several times faster than the default json.dumps path
+    default_response_class=ORJSONResponse
 )
 
 # Set up Prometheus metrics instrumentation for monitoring
-Instrumentator().instrument(app).expose(app)
+# Probe and scrape paths are excluded: kubelet hits /health and /ready every
+# few seconds and those requests should not pay the histogram-update cost
+Instrumentator(
+    excluded_handlers=["/health", "/ready", "/metrics"],
+    should_group_status_codes=True
+).instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
+
+# Response row schemas
+# msgspec knows field names and types at encode time, so serialization
+# skips the per-key dict hashing that dict -> orjson pays. Field order
+# must match the SELECT column order: rows are built positionally.
+class Item(msgspec.Struct):
+    id: int
+    name: str
+    description: Optional[str]
+    created_at: datetime
+
+
+class FootballClub(msgspec.Struct):
+    id: int
+    name: str
+    country: str
+    founded_year: Optional[int]
+    created_at: datetime
+
+
+# Shared schema-aware JSON encoder (C-level, zero-copy)
+JSON_ENCODER = msgspec.json.Encoder()
 
 # Global connection pool
 connection_pool = None
 
+# In-process TTL cache holding pre-encoded JSON bytes per endpoint.
+# TTLCache itself is not async-safe, so all access goes through cache_lock.
+response_cache: TTLCache = TTLCache(maxsize=32, ttl=CACHE_TTL)
+cache_lock = asyncio.Lock()
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Weak ETag derived from the response bytes
+    """
+    return f'W/"{blake2b(body, digest_size=8).hexdigest()}"'
+
+
+async def cache_get(key: str):
+    """
+    Return cached (body, etag) for key, or None on miss/expiry
+    """
+    async with cache_lock:
+        return response_cache.get(key)
+
+
+async def cache_set(key: str, value: bytes) -> str:
+    """
+    Store pre-encoded response bytes for key and return their ETag
+    """
+    etag = compute_etag(value)
+    async with cache_lock:
+        response_cache[key] = (value, etag)
+    return etag
+
+
+def conditional_response(request: Request, body: bytes, etag: str) -> Response:
+    """
+    Build a JSON response honoring If-None-Match
+    Clients holding the current representation get a header-only 304;
+    everyone else gets the body plus ETag/Cache-Control so the next call
+    can revalidate instead of re-downloading
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={CACHE_TTL}"
+    }
+    if request.headers.get("if-none-match") == etag:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers=headers
+    )
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -54,21 +204,24 @@ async def startup_event():
     """
     global connection_pool
     try:
-        connection_pool = psycopg2.pool.SimpleConnectionPool(
-            DB_MIN_CONN,
-            DB_MAX_CONN,
+        connection_pool = await asyncpg.create_pool(
+            min_size=DB_MIN_CONN,
+            max_size=DB_MAX_CONN,
             host=DB_HOST,
             database=DB_NAME,
             user=DB_USER,
             password=DB_PASSWORD,
-            cursor_factory=RealDictCursor
+            # Server-side prepared statements skip re-parsing/re-planning on
+            # every request, but PgBouncer transaction pooling cannot track
+            # them - only enable the statement cache in session mode
+            statement_cache_size=100 if DB_POOL_MODE == "session" else 0
         )
         logger.info(
-            f"Database connection pool created successfully. "
-            f"Min: {DB_MIN_CONN}, Max: {DB_MAX_CONN}"
+            "Database connection pool created successfully",
+            extra={"extra": {"min": DB_MIN_CONN, "max": DB_MAX_CONN}}
         )
     except Exception as e:
-        logger.error(f"Failed to create database connection pool: {str(e)}")
+        logger.error("Failed to create database connection pool: %s", e)
         raise
 
 
@@ -79,35 +232,45 @@ async def shutdown_event():
     """
     global connection_pool
     if connection_pool:
-        connection_pool.closeall()
+        await connection_pool.close()
         logger.info("Database connection pool closed")
 
 
-@contextmanager
-def get_db_connection() -> Generator:
+@asynccontextmanager
+async def get_db_connection() -> AsyncGenerator[asyncpg.Connection, None]:
     """
-    Context manager for database connections from the pool
+    Async context manager for database connections from the pool
     Ensures connections are properly returned to the pool
+    Release always runs the pool's reset, which rolls back any open
+    transaction, so an exception from the caller cannot leak an
+    'idle in transaction' Postgres backend. Queries run here outside an
+    explicit transaction commit implicitly (autocommit), the cheapest
+    mode for pure-SELECT workloads.
     """
-    conn = None
+    if connection_pool is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to get database connection from pool"
+        )
     try:
-        conn = connection_pool.getconn()
-        if conn:
+        async with connection_pool.acquire(
+            timeout=DB_ACQUIRE_TIMEOUT
+        ) as conn:
             yield conn
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Unable to get database connection from pool"
-            )
-    except OperationalError as e:
-        logger.error(f"Database operational error: {str(e)}")
+    except asyncio.TimeoutError:
+        # Bounded wait instead of queueing forever when the pool is
+        # exhausted; the caller gets a fast 503 it can retry
+        logger.error("Timed out waiting for a pooled database connection")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to get database connection from pool"
+        )
+    except (asyncpg.PostgresConnectionError, OSError) as e:
+        logger.error("Database operational error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Database connection error"
         )
-    finally:
-        if conn:
-            connection_pool.putconn(conn)
 
 
 # Middleware to add request ID for distributed tracing
@@ -119,7 +282,14 @@ async def add_request_id(request: Request, call_next):
     request_id = request.headers.get("X-Request-ID", "unknown")
     request.state.request_id = request_id
 
-    logger.info(f"Request: {request.method} {request.url.path} - request_id: {request_id}")
+    logger.info(
+        "Request received",
+        extra={"extra": {
+            "method": request.method,
+            "path": request.url.path,
+            "request_id": request_id
+        }}
+    )
 
     response = await call_next(request)
     response.headers["X-Request-ID"] = request_id
@@ -127,134 +297,321 @@ async def add_request_id(request: Request, call_next):
     return response
 
 
+# Pre-encoded liveness payload; the probe fires several times per second
+# per pod, so skip re-serialization entirely. The bytes are shared but a
+# fresh Response is built per call because middleware mutates headers.
+HEALTHY_BYTES = orjson.dumps({"status": "healthy", "service": "backend"})
+
+
 # Health check endpoint for liveness probe
 @app.get("/health", tags=["Health"])
-def health_check():
+async def health_check():
     """
     Health check endpoint for liveness probe
     Returns 200 if the application is running
     Does not check database connectivity
     """
-    return {"status": "healthy", "service": "backend"}
+    return Response(content=HEALTHY_BYTES, media_type="application/json")
 
 
 # Readiness check endpoint that verifies database connectivity
 @app.get("/ready", tags=["Health"])
-def readiness_check():
+async def readiness_check():
     """
     Readiness check endpoint for readiness probe
     Verifies database connectivity before marking as ready
     Returns 200 if database is accessible, 503 otherwise
     """
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                # Simple query to verify database connectivity
-                cur.execute("SELECT 1")
-                result = cur.fetchone()
-
-                if result:
-                    return {
-                        "status": "ready",
-                        "database": "connected",
-                        "pool_available": connection_pool.maxconn - len(connection_pool._used)
-                    }
-                else:
-                    logger.warning("Database readiness check failed: no result")
-                    raise HTTPException(
-                        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                        detail="Database not responding"
-                    )
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Readiness check failed: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Service not ready"
-        )
+    async with get_db_connection() as conn:
+        # Simple query to verify database connectivity
+        result = await conn.fetchval("SELECT 1")
+
+    if result:
+        return {
+            "status": "ready",
+            "database": "connected",
+            "pool_available": connection_pool.get_idle_size()
+        }
+
+    logger.warning("Database readiness check failed: no result")
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Database not responding"
+    )
 
 
 # Data endpoint that serves the main API functionality
 @app.get("/data", tags=["Data"])
-def get_data(request: Request):
+async def get_data(
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
     """
-    Retrieves data from the items table
+    Retrieves a page of data from the items table
+    Keyset pagination: pass the returned next_cursor as `after` to get
+    the next page (cost stays O(limit), unlike OFFSET)
     """
     request_id = getattr(request.state, "request_id", "unknown")
-    logger.info(f"Fetching data from items table - request_id: {request_id}")
+    cache_key = f"items:{after}:{limit}"
+
+    # Cache-hit path: serve pre-encoded JSON bytes straight from memory
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return conditional_response(request, *cached)
+
+    logger.info("Fetching data from items table", extra={"extra": {"request_id": request_id}})
+
+    async with get_db_connection() as conn:
+        # Postgres assembles the JSON array at C speed; Python never
+        # materializes the rows, it just wraps the pre-built string
+        row = await conn.fetchrow(
+            "SELECT COALESCE(json_agg(row_to_json(t) ORDER BY t.id), "
+            "'[]'::json)::text AS j, max(t.id) AS last_id, count(*) AS n "
+            "FROM (SELECT id, name, description, created_at FROM items "
+            "WHERE id > $1 ORDER BY id LIMIT $2) t",
+            after, limit
+        )
+        next_cursor = row["last_id"] if row["n"] == limit else None
 
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT id, name, description, created_at FROM items ORDER BY id"
-                )
-                items = cur.fetchall()
-
-                logger.info(
-                    f"Successfully fetched {len(items)} items - request_id: {request_id}"
-                )
-                return {"data": items}
-
-    except HTTPException:
-        raise
-    except DatabaseError as e:
-        logger.error(f"Database error in get_data: {str(e)} - request_id: {request_id}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database query error"
+        logger.info(
+            "Successfully fetched items",
+            extra={"extra": {"count": row["n"], "request_id": request_id}}
         )
-    except Exception as e:
-        logger.exception(f"Unexpected error in get_data - request_id: {request_id}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+        body = (
+            b'{"data":' + row["j"].encode()
+            + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
         )
+        etag = await cache_set(cache_key, body)
+        return conditional_response(request, body, etag)
 
 
 # Football clubs endpoint that returns list of football clubs
 @app.get("/footballClub", tags=["Data"])
-def get_football_clubs(request: Request):
+async def get_football_clubs(
+    request: Request,
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500)
+):
     """
-    Returns a list of football clubs from the database
+    Returns a page of football clubs from the database
+    Keyset pagination: pass the returned next_cursor as `after` to get
+    the next page (cost stays O(limit), unlike OFFSET)
     """
     request_id = getattr(request.state, "request_id", "unknown")
-    logger.info(f"Fetching football clubs - request_id: {request_id}")
+    cache_key = f"clubs:{after}:{limit}"
+
+    # Cache-hit path: serve pre-encoded JSON bytes straight from memory
+    cached = await cache_get(cache_key)
+    if cached is not None:
+        return conditional_response(request, *cached)
+
+    logger.info("Fetching football clubs", extra={"extra": {"request_id": request_id}})
+
+    async with get_db_connection() as conn:
+        # Postgres assembles the JSON array at C speed; Python never
+        # materializes the rows, it just wraps the pre-built string
+        row = await conn.fetchrow(
+            "SELECT COALESCE(json_agg(row_to_json(t) ORDER BY t.id), "
+            "'[]'::json)::text AS j, max(t.id) AS last_id, count(*) AS n "
+            "FROM (SELECT id, name, country, founded_year, created_at "
+            "FROM football_clubs WHERE id > $1 ORDER BY id LIMIT $2) t",
+            after, limit
+        )
+        next_cursor = row["last_id"] if row["n"] == limit else None
 
-    try:
-        with get_db_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    "SELECT id, name, country, founded_year, created_at "
-                    "FROM football_clubs ORDER BY id"
-                )
-                clubs = cur.fetchall()
-
-                logger.info(
-                    f"Successfully fetched {len(clubs)} clubs - request_id: {request_id}"
-                )
-                return {"clubs": clubs}
-
-    except HTTPException:
-        raise
-    except DatabaseError as e:
-        logger.error(
-            f"Database error in get_football_clubs: {str(e)} - request_id: {request_id}"
+        logger.info(
+            "Successfully fetched clubs",
+            extra={"extra": {"count": row["n"], "request_id": request_id}}
         )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database query error"
+        body = (
+            b'{"clubs":' + row["j"].encode()
+            + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
         )
-    except Exception as e:
-        logger.exception(
-            f"Unexpected error in get_football_clubs - request_id: {request_id}"
+        etag = await cache_set(cache_key, body)
+        return conditional_response(request, body, etag)
+
+
+# Bundle endpoint returning both datasets in a single round-trip for callers
+@app.get("/bundle", tags=["Data"])
+async def get_bundle(request: Request):
+    """
+    Returns items and football clubs together
+    Both SELECTs run inside one transaction on one pooled connection, so
+    callers needing both datasets pay a single backend round-trip instead
+    of two
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+
+    # Cache-hit path: serve pre-encoded JSON bytes straight from memory
+    cached = await cache_get("bundle")
+    if cached is not None:
+        return conditional_response(request, *cached)
+
+    logger.info("Fetching bundle", extra={"extra": {"request_id": request_id}})
+
+    async with get_db_connection() as conn:
+        # A single transaction pipelines both queries over the wire
+        async with conn.transaction():
+            item_rows = await conn.fetch(
+                "SELECT id, name, description, created_at "
+                "FROM items ORDER BY id"
+            )
+            club_rows = await conn.fetch(
+                "SELECT id, name, country, founded_year, created_at "
+                "FROM football_clubs ORDER BY id"
+            )
+
+        # Build Structs positionally from the Records, skipping the dict hop
+        items = [Item(*r) for r in item_rows]
+        clubs = [FootballClub(*r) for r in club_rows]
+
+        logger.info(
+            "Successfully fetched bundle",
+            extra={"extra": {
+                "items": len(items),
+                "clubs": len(clubs),
+                "request_id": request_id
+            }}
+        )
+        body = JSON_ENCODER.encode({"items": items, "clubs": clubs})
+        etag = await cache_set("bundle", body)
+        return conditional_response(request, body, etag)
+
+
+async def stream_table(
+    query: str,
+    envelope_key: str,
+    row_type: Type[msgspec.Struct]
+) -> StreamingResponse:
+    """
+    Streams query results as a JSON array wrapped in {"<envelope_key>": [...]}
+    A server-side cursor fetches rows in batches, so memory stays constant
+    and the first bytes go out before the full result set is read.
+    The connection is acquired before the StreamingResponse exists so an
+    acquisition failure can still set an error status code; once the 200
+    and first chunk are sent, errors can only truncate the body.
+    """
+    try:
+        conn = await connection_pool.acquire(timeout=DB_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        # Same bounded-wait contract as get_db_connection: a fast,
+        # retryable 503 instead of queueing forever on an exhausted pool
+        logger.error("Timed out waiting for a pooled database connection")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to get database connection from pool"
         )
+    except (asyncpg.PostgresConnectionError, OSError) as e:
+        logger.error("Database operational error: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Internal server error"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection error"
         )
 
+    async def generate():
+        try:
+            yield b'{"' + envelope_key.encode() + b'":['
+            first = True
+            batch = []
+            # asyncpg server-side cursors require a transaction
+            async with conn.transaction():
+                async for row in conn.cursor(query, prefetch=STREAM_BATCH_SIZE):
+                    batch.append(JSON_ENCODER.encode(row_type(*row)))
+                    if len(batch) >= STREAM_BATCH_SIZE:
+                        chunk = b",".join(batch)
+                        yield chunk if first else b"," + chunk
+                        first = False
+                        batch = []
+            if batch:
+                chunk = b",".join(batch)
+                yield chunk if first else b"," + chunk
+            yield b"]}"
+        finally:
+            await connection_pool.release(conn)
+
+    return StreamingResponse(generate(), media_type="application/json")
+
+
+# Streaming endpoint returning the full items table with constant memory
+@app.get("/data/stream", tags=["Data"])
+async def stream_data(request: Request):
+    """
+    Streams the entire items table as JSON
+    Unlike /data this is not paginated or cached; use it for exports
+    where the result set may be large
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.info("Streaming items table", extra={"extra": {"request_id": request_id}})
+
+    return await stream_table(
+        "SELECT id, name, description, created_at FROM items ORDER BY id",
+        "data",
+        Item
+    )
+
+
+# Streaming endpoint returning all football clubs with constant memory
+@app.get("/footballClub/stream", tags=["Data"])
+async def stream_football_clubs(request: Request):
+    """
+    Streams the entire football_clubs table as JSON
+    Unlike /footballClub this is not paginated or cached; use it for
+    exports where the result set may be large
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.info("Streaming football clubs table", extra={"extra": {"request_id": request_id}})
+
+    return await stream_table(
+        "SELECT id, name, country, founded_year, created_at "
+        "FROM football_clubs ORDER BY id",
+        "clubs",
+        FootballClub
+    )
+
+
+# Admin endpoint to drop cached responses after out-of-band data changes
+@app.post("/cache/invalidate", tags=["Admin"])
+async def invalidate_cache():
+    """
+    Clears the in-process response cache of this worker only
+    The cache is per process: with multiple uvicorn workers across
+    multiple replicas, the Service routes this call to exactly one of
+    them, so invalidation is best-effort. The TTL bounds how long the
+    other workers keep serving stale data. Call after modifying items
+    or football_clubs outside the API.
+    """
+    async with cache_lock:
+        response_cache.clear()
+    logger.info("Response cache invalidated (this worker only)")
+    return {
+        "status": "cache invalidated",
+        "scope": "this worker process only",
+        "note": f"other workers serve cached responses for up to {CACHE_TTL}s"
+    }
+
+
+# Database error handler - replaces the per-route try/except ladders so
+# query endpoints contain just the query and the return
+@app.exception_handler(asyncpg.PostgresError)
+async def postgres_error_handler(request: Request, exc: asyncpg.PostgresError):
+    """
+    Maps unhandled database errors to a 500 response
+    """
+    request_id = getattr(request.state, "request_id", "unknown")
+    logger.error(
+        "Database error: %s", exc,
+        extra={"extra": {"path": request.url.path, "request_id": request_id}}
+    )
+
+    return ORJSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "detail": "Database query error",
+            "request_id": request_id
+        }
+    )
+
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -263,9 +620,9 @@ async def global_exception_handler(request: Request, exc: Exception):
     Global exception handler to catch any unhandled exceptions
     """
     request_id = getattr(request.state, "request_id", "unknown")
-    logger.exception(f"Unhandled exception - request_id: {request_id}")
+    logger.exception("Unhandled exception", extra={"extra": {"request_id": request_id}})
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "detail": "Internal server error",
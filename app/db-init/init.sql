@@ -21,6 +21,11 @@ CREATE TABLE IF NOT EXISTS items (
 -- Index for frequent name lookups (used in /data endpoint)
 CREATE INDEX IF NOT EXISTS idx_items_name ON items(name);
 
+-- Covering index so the /data projection is an index-only scan
+-- (no heap fetch per row once the visibility map is current)
+CREATE INDEX IF NOT EXISTS idx_items_cover
+    ON items (id) INCLUDE (name, description, created_at);
+
 -- Index for timestamp queries
 CREATE INDEX IF NOT EXISTS idx_items_created_at ON items(created_at DESC);
 
@@ -44,6 +49,11 @@ CREATE TABLE IF NOT EXISTS football_clubs (
 
 -- Indexes for frequent queries (used in /footballClub endpoint)
 CREATE INDEX IF NOT EXISTS idx_football_clubs_name ON football_clubs(name);
+
+-- Covering index so the /footballClub projection is an index-only scan
+-- (no heap fetch per row once the visibility map is current)
+CREATE INDEX IF NOT EXISTS idx_football_clubs_cover
+    ON football_clubs (id) INCLUDE (name, country, founded_year, created_at);
 CREATE INDEX IF NOT EXISTS idx_football_clubs_country ON football_clubs(country);
 CREATE INDEX IF NOT EXISTS idx_football_clubs_created_at ON football_clubs(created_at DESC);
 
@@ -0,0 +1,34 @@
+-- ============================================
+-- Migration 001: Covering indexes for API read paths
+-- Description: Index-only scan support for /data and /footballClub
+-- Apply to EXISTING databases only; fresh clusters get these from
+-- init.sql. Run with psql against the live database:
+--   kubectl exec -n demo-app deploy/postgres -- \
+--     psql -U $POSTGRES_USER -d $POSTGRES_DB -f /path/to/this/file
+-- ============================================
+
+-- CONCURRENTLY avoids locking writes while the index builds; it cannot
+-- run inside a transaction block (psql runs each statement standalone)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_items_cover
+    ON items (id) INCLUDE (name, description, created_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_football_clubs_cover
+    ON football_clubs (id) INCLUDE (name, country, founded_year, created_at);
+
+-- ============================================
+-- VERIFICATION
+-- Description: Confirm the planner uses an index-only scan
+-- Expect "Index Only Scan using idx_items_cover" with "Heap Fetches: 0"
+-- (run VACUUM first so the visibility map is current; the planner may
+-- still prefer a seq scan while the tables hold only seed data)
+-- ============================================
+-- EXPLAIN (ANALYZE, BUFFERS)
+--     SELECT id, name, description, created_at
+--     FROM items ORDER BY id LIMIT 100;
+-- EXPLAIN (ANALYZE, BUFFERS)
+--     SELECT id, name, country, founded_year, created_at
+--     FROM football_clubs ORDER BY id LIMIT 100;
+
+-- ============================================
+-- End of migration 001
+-- ============================================
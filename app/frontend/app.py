@@ -1,208 +1,354 @@
 """
-Frontend Service - Flask Application
+Frontend Service - FastAPI Application
 Provides API endpoints that proxy requests to the backend service
 """
 
+import asyncio
+import atexit
 import os
 import logging
+import logging.handlers
+import queue
 import sys
-from flask import Flask, jsonify, request
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from prometheus_flask_exporter import PrometheusMetrics
-
-# Configure structured logging (JSON format)
-logging.basicConfig(
-    level=logging.INFO,
-    format='{"time":"%(asctime)s", "level":"%(levelname)s", "message":"%(message)s", "module":"%(module)s"}',
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
-logger = logging.getLogger(__name__)
 
-# Initialize Flask application
-app = Flask(__name__)
+from fastapi import FastAPI, Request, Response, status
+from fastapi.responses import ORJSONResponse
+from prometheus_fastapi_instrumentator import Instrumentator
+import httpx
+import orjson
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Render log records as JSON with orjson
+    Builds a dict per record instead of interpolating a JSON-shaped format
+    string, so messages containing braces or quotes stay valid JSON.
+    Structured fields passed via extra={"extra": {...}} are merged in.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "module": record.module,
+            **getattr(record, "extra", {})
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return orjson.dumps(entry).decode()
 
-# Initialize Prometheus metrics
-metrics = PrometheusMetrics(app)
-# Add custom metric info
-metrics.info('frontend_app_info', 'Frontend Application Info', version='1.0.0')
+
+class PassthroughQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records without pre-formatting them
+    The stock prepare() renders the record with this handler's own
+    formatter and nulls exc_info before enqueueing, so the listener's
+    JSONFormatter would see an already-formatted message and no
+    exception data. Only %-args are merged on the caller's thread (they
+    may be mutated before the listener runs); formatting is left
+    entirely to the listener side.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Configure structured logging (JSON format) behind a queue
+# The handler only enqueues records; formatting and the stdout write
+# (which holds a lock and can stall on buffering) happen on a listener
+# thread, keeping log IO off the request critical path. The handler is
+# attached directly rather than via basicConfig, which would give it a
+# default formatter and trigger prepare()'s pre-formatting path.
+log_queue = queue.SimpleQueue()
+stream_handler = logging.StreamHandler(sys.stdout)
+stream_handler.setFormatter(JSONFormatter())
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(PassthroughQueueHandler(log_queue))
+log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+log_listener.start()
+atexit.register(log_listener.stop)  # Flush queued records on shutdown
+logger = logging.getLogger(__name__)
 
 # Configuration from environment variables
 BACKEND_BASE_URL = os.getenv("BACKEND_BASE_URL", "http://backend:8000")
-BACKEND_DATA_URL = f"{BACKEND_BASE_URL}/data"
-BACKEND_FOOTBALL_URL = f"{BACKEND_BASE_URL}/footballClub"
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "5"))  # seconds
 
-# Configure requests session with retry logic and connection pooling
-def create_session():
+# Initialize FastAPI application
+app = FastAPI(
+    title="Frontend Service",
+    version="1.0.0",
+    description="Frontend proxy for k8s-platform demo",
+    default_response_class=ORJSONResponse
+)
+
+# Set up Prometheus metrics instrumentation for monitoring
+# Probe and scrape paths are excluded: kubelet hits /health and /ready every
+# few seconds and those requests should not pay the histogram-update cost
+Instrumentator(
+    excluded_handlers=["/health", "/ready", "/metrics"],
+    should_group_status_codes=True
+).instrument(app).expose(app, endpoint="/metrics", include_in_schema=False)
+
+# Global async HTTP client shared by all in-flight requests
+http_client = None
+
+# Last seen ETag and decoded payload per backend path, so unchanged
+# responses revalidate with a header-only 304 instead of re-downloading
+# and re-parsing identical JSON
+etag_cache = {}
+etag_lock = asyncio.Lock()
+
+
+async def backend_get(path: str, request_id: str):
     """
-    Create a requests session with retry logic and connection pooling
+    GET a backend path with conditional revalidation
+    Sends If-None-Match with the last seen ETag; on 304 the stored
+    payload is reused without any JSON parsing. Raises httpx errors like
+    a plain client.get + raise_for_status would.
     """
-    session = requests.Session()
+    async with etag_lock:
+        cached = etag_cache.get(path)
 
-    # Retry strategy: 3 retries with exponential backoff
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,  # 1s, 2s, 4s delays
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "POST"]
-    )
+    headers = {"X-Request-ID": request_id}
+    if cached:
+        headers["If-None-Match"] = cached[0]
 
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,
-        pool_maxsize=10
+    response = await http_client.get(path, headers=headers)
+    if response.status_code == 304 and cached:
+        return cached[1]
+    response.raise_for_status()
+
+    payload = response.json()
+    etag = response.headers.get("etag")
+    if etag:
+        async with etag_lock:
+            etag_cache[path] = (etag, payload)
+    return payload
+
+
+@app.on_event("startup")
+async def startup_event():
+    """
+    Create the shared backend HTTP client on application startup
+    One keepalive pool serves all concurrent tasks; HTTP/2 lets many
+    in-flight backend calls multiplex over a single connection
+    """
+    global http_client
+    http_client = httpx.AsyncClient(
+        base_url=BACKEND_BASE_URL,
+        timeout=REQUEST_TIMEOUT,
+        transport=httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,  # Retries connection establishment with backoff
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50
+            )
+        )
     )
+    logger.info("Backend HTTP client created. Base URL: %s", BACKEND_BASE_URL)
 
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
 
-    return session
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Close the backend HTTP client on application shutdown
+    """
+    global http_client
+    if http_client:
+        await http_client.aclose()
+        logger.info("Backend HTTP client closed")
+
+
+# Pre-encoded liveness payload; the probe fires several times per second
+# per pod, so skip re-serialization entirely
+HEALTHY_BYTES = orjson.dumps({"status": "healthy", "service": "frontend"})
 
-# Create global session for connection pooling
-http_session = create_session()
 
 # Health check endpoint for Kubernetes probes
-@app.route("/health")
-def health():
+@app.get("/health", tags=["Health"])
+async def health():
     """
     Health check endpoint for liveness probe
     Returns 200 if the application is running
     """
-    return jsonify({"status": "healthy", "service": "frontend"}), 200
+    return Response(content=HEALTHY_BYTES, media_type="application/json")
+
 
 # Readiness check endpoint
-@app.route("/ready")
-def ready():
+@app.get("/ready", tags=["Health"])
+async def ready():
     """
     Readiness check endpoint - verifies backend connectivity
     Returns 200 if backend is reachable, 503 otherwise
     """
     try:
-        response = http_session.get(
-            f"{BACKEND_BASE_URL}/health",
-            timeout=2
-        )
+        response = await http_client.get("/health", timeout=2)
         if response.status_code == 200:
-            return jsonify({"status": "ready", "backend": "connected"}), 200
+            return {"status": "ready", "backend": "connected"}
         else:
-            logger.warning(f"Backend health check failed: {response.status_code}")
-            return jsonify({"status": "not_ready", "backend": "unhealthy"}), 503
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Backend readiness check failed: {str(e)}")
-        return jsonify({"status": "not_ready", "backend": "unreachable"}), 503
+            logger.warning("Backend health check failed: %s", response.status_code)
+            return ORJSONResponse(
+                {"status": "not_ready", "backend": "unhealthy"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+    except httpx.HTTPError as e:
+        logger.error("Backend readiness check failed: %s", e)
+        return ORJSONResponse(
+            {"status": "not_ready", "backend": "unreachable"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
 
 # Route for the home page
-@app.route("/")
-def home():
+@app.get("/", tags=["Proxy"])
+async def home(request: Request):
     """
     Home endpoint - fetches data from backend /data endpoint
     """
-    request_id = request.headers.get('X-Request-ID', 'unknown')
-    logger.info(f"Home endpoint called - request_id: {request_id}")
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    logger.info("Home endpoint called", extra={"extra": {"request_id": request_id}})
 
     try:
-        # Make GET request to backend service with timeout
-        response = http_session.get(
-            BACKEND_DATA_URL,
-            timeout=REQUEST_TIMEOUT,
-            headers={'X-Request-ID': request_id}
-        )
-        response.raise_for_status()  # Raise exception for 4xx/5xx status codes
+        # Conditional GET to backend service (timeout set on the client)
+        data = await backend_get("/data", request_id)
 
-        # Parse JSON response from backend
-        data = response.json()
-
-        logger.info(f"Successfully fetched data from backend - request_id: {request_id}")
-        return jsonify({
-            "frontend": "Hello from Flask!",
+        logger.info(
+            "Successfully fetched data from backend",
+            extra={"extra": {"request_id": request_id}}
+        )
+        return {
+            "frontend": "Hello from FastAPI!",
             "backend": data
-        }), 200
+        }
 
-    except requests.exceptions.Timeout:
-        logger.error(f"Backend request timeout - request_id: {request_id}")
-        return jsonify({
+    except httpx.TimeoutException:
+        logger.error("Backend request timeout", extra={"extra": {"request_id": request_id}})
+        return ORJSONResponse({
             "error": "Backend service timeout",
             "message": "The backend service took too long to respond"
-        }), 504  # Gateway Timeout
+        }, status_code=status.HTTP_504_GATEWAY_TIMEOUT)
 
-    except requests.exceptions.ConnectionError:
-        logger.error(f"Backend connection error - request_id: {request_id}")
-        return jsonify({
+    except httpx.TransportError:
+        logger.error("Backend connection error", extra={"extra": {"request_id": request_id}})
+        return ORJSONResponse({
             "error": "Backend service unavailable",
             "message": "Could not connect to backend service"
-        }), 503  # Service Unavailable
+        }, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"Backend HTTP error: {e} - request_id: {request_id}")
-        return jsonify({
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "Backend HTTP error: %s", e,
+            extra={"extra": {"request_id": request_id}}
+        )
+        return ORJSONResponse({
             "error": "Backend error",
             "message": "Backend returned an error"
-        }), 502  # Bad Gateway
+        }, status_code=status.HTTP_502_BAD_GATEWAY)
 
     except Exception as e:
-        logger.exception(f"Unexpected error in home endpoint - request_id: {request_id}")
-        return jsonify({
+        logger.exception(
+            "Unexpected error in home endpoint",
+            extra={"extra": {"request_id": request_id}}
+        )
+        return ORJSONResponse({
             "error": "Internal server error",
             "message": "An unexpected error occurred"
-        }), 500
+        }, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+# Combined route that fans out to both backend endpoints concurrently
+@app.get("/home", tags=["Proxy"])
+async def combined(request: Request):
+    """
+    Combined endpoint - fetches items and clubs from the backend
+    Both calls run concurrently via asyncio.gather, so total latency is
+    the max of the two backend calls rather than their sum
+    """
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    logger.info("Combined endpoint called", extra={"extra": {"request_id": request_id}})
+
+    data_result, clubs_result = await asyncio.gather(
+        backend_get("/data", request_id),
+        backend_get("/footballClub", request_id),
+        # One failing call should not nuke the whole response
+        return_exceptions=True
+    )
+
+    def unwrap(result, name):
+        """
+        Turn a gather result into a response section, degrading gracefully
+        """
+        if isinstance(result, Exception):
+            logger.error(
+                "Backend %s call failed: %s", name, result,
+                extra={"extra": {"request_id": request_id}}
+            )
+            return {"error": "Backend service unavailable"}
+        return result
+
+    return {
+        "data": unwrap(data_result, "/data"),
+        "clubs": unwrap(clubs_result, "/footballClub")
+    }
+
 
 # Route for football clubs
-@app.route("/clubs")
-def football_clubs():
+@app.get("/clubs", tags=["Proxy"])
+async def football_clubs(request: Request):
     """
     Football clubs endpoint - fetches club data from backend
     """
-    request_id = request.headers.get('X-Request-ID', 'unknown')
-    logger.info(f"Clubs endpoint called - request_id: {request_id}")
+    request_id = request.headers.get("X-Request-ID", "unknown")
+    logger.info("Clubs endpoint called", extra={"extra": {"request_id": request_id}})
 
     try:
-        # Make GET request to football clubs endpoint with timeout
-        response = http_session.get(
-            BACKEND_FOOTBALL_URL,
-            timeout=REQUEST_TIMEOUT,
-            headers={'X-Request-ID': request_id}
-        )
-        response.raise_for_status()
+        # Conditional GET to football clubs endpoint
+        clubs = await backend_get("/footballClub", request_id)
 
-        logger.info(f"Successfully fetched clubs from backend - request_id: {request_id}")
-        return jsonify(response.json()), 200
+        logger.info(
+            "Successfully fetched clubs from backend",
+            extra={"extra": {"request_id": request_id}}
+        )
+        return clubs
 
-    except requests.exceptions.Timeout:
-        logger.error(f"Backend request timeout - request_id: {request_id}")
-        return jsonify({
+    except httpx.TimeoutException:
+        logger.error("Backend request timeout", extra={"extra": {"request_id": request_id}})
+        return ORJSONResponse({
             "error": "Backend service timeout",
             "message": "The backend service took too long to respond"
-        }), 504
+        }, status_code=status.HTTP_504_GATEWAY_TIMEOUT)
 
-    except requests.exceptions.ConnectionError:
-        logger.error(f"Backend connection error - request_id: {request_id}")
-        return jsonify({
+    except httpx.TransportError:
+        logger.error("Backend connection error", extra={"extra": {"request_id": request_id}})
+        return ORJSONResponse({
             "error": "Backend service unavailable",
             "message": "Could not connect to backend service"
-        }), 503
+        }, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
 
-    except requests.exceptions.HTTPError as e:
-        logger.error(f"Backend HTTP error: {e} - request_id: {request_id}")
-        return jsonify({
+    except httpx.HTTPStatusError as e:
+        logger.error(
+            "Backend HTTP error: %s", e,
+            extra={"extra": {"request_id": request_id}}
+        )
+        return ORJSONResponse({
             "error": "Backend error",
             "message": "Backend returned an error"
-        }), 502
+        }, status_code=status.HTTP_502_BAD_GATEWAY)
 
     except Exception as e:
-        logger.exception(f"Unexpected error in clubs endpoint - request_id: {request_id}")
-        return jsonify({
+        logger.exception(
+            "Unexpected error in clubs endpoint",
+            extra={"extra": {"request_id": request_id}}
+        )
+        return ORJSONResponse({
             "error": "Internal server error",
             "message": "An unexpected error occurred"
-        }), 500
-
-# Run the application if this file is executed directly
-if __name__ == "__main__":
-    logger.info(f"Starting frontend service on port 5000")
-    logger.info(f"Backend URL: {BACKEND_BASE_URL}")
-    logger.info(f"Request timeout: {REQUEST_TIMEOUT}s")
+        }, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    # Start Flask server - for development only
-    # In production, use Gunicorn (see Dockerfile)
-    app.run(host="0.0.0.0", port=5000)